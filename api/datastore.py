@@ -12,29 +12,339 @@ We store short-timescale samples of:
 - net_samples
 - fan_samples
 
+plus per-minute rollups (cpu_samples_1m, mem_samples_1m, gpu_samples_1m)
+that back the longer history windows.
+
+The schema is created at import time (skip with SENTRA_SKIP_DB_INIT=1);
+callers that can't rely on that should call init_db_if_needed() once up front.
+
 We expose:
+    connect()
     init_db_if_needed()
-    insert_snapshot(snapshot, gpus)
+    insert_snapshot(snapshot, gpus, conn=None)
+    insert_snapshots(batch, conn=None)
     get_cpu_mem_history(minutes=60)
     get_gpu_history(minutes=60)
     purge_before(cutoff_ts)
 """
 
-import json
+import logging
+import os
+import tempfile
+import threading
 import time
-from typing import Any, Dict, List
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
 
+import numpy as np
 import pandas as pd
 import mysql.connector
 from mysql.connector import errorcode
+from mysql.connector.errors import PoolError
+from mysql.connector.pooling import CNX_POOL_MAXSIZE, MySQLConnectionPool, PooledMySQLConnection
 
 from config import config
 
+log = logging.getLogger(__name__)
+
+# connectorx reads query results straight into Arrow buffers; fall back to
+# pandas.read_sql_query over the pool when it isn't installed.
+try:
+    import connectorx as cx
+except ImportError:
+    cx = None
+
+
+# mysql.connector caps pools at CNX_POOL_MAXSIZE connections.
+_POOL_SIZE = max(1, min(config.DB_POOL_SIZE, CNX_POOL_MAXSIZE))
+# get_connection() fails immediately on an empty pool; wait this long for a
+# connection to be returned before giving up.
+_POOL_WAIT_SECONDS = 10.0
+
+# Bump whenever init_db_if_needed gains new DDL so existing sentinels are ignored.
+_SCHEMA_VERSION = 8
+
+_SAMPLE_TABLES = (
+    "cpu_samples",
+    "mem_samples",
+    "gpu_samples",
+    "disk_samples",
+    "net_samples",
+    "fan_samples",
+)
+
+# Temperature / utilisation / percent columns stored as FLOAT (see init_db_if_needed).
+_FLOAT_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "cpu_samples": ("total_util", "iowait", "cpu_temp", "user_pct", "system_pct"),
+    "mem_samples": ("used_percent", "swap_used_percent"),
+    "gpu_samples": ("temp", "util", "fan_percent"),
+    "disk_samples": ("usage_percent",),
+    "cpu_samples_1m": ("total_util", "cpu_temp"),
+    "mem_samples_1m": ("used_percent", "swap_used_percent"),
+    "gpu_samples_1m": ("temp", "util", "fan_percent"),
+}
+
+# Sample tables are RANGE-partitioned by UTC day on ts, with a trailing
+# MAXVALUE partition that gets split ahead of time.
+_DAY_SECONDS = 24 * 60 * 60
+_PARTITION_DAYS_AHEAD = 3
+
+# Row DELETEs are issued in chunks of this size with a commit in between so
+# the undo log stays small and insert_snapshot can interleave.
+_PURGE_CHUNK_ROWS = 5000
+
+# Minute-resolution rollups refreshed from the insert path. History windows of
+# at least _ROLLUP_MIN_WINDOW_MINUTES read these instead of the raw samples.
+_ROLLUP_TABLES = ("cpu_samples_1m", "mem_samples_1m", "gpu_samples_1m")
+_ROLLUP_MIN_WINDOW_MINUTES = 60
+# How far back the first rollup of a process reaches.
+_ROLLUP_BACKFILL_SECONDS = 24 * 60 * 60
+
+# ts range index each history query drives from; results aren't ORDER BY'd
+# server-side, the reader sorts once instead.
+_HISTORY_TS_INDEX = {
+    "cpu_samples": "idx_cpu_ts",
+    "gpu_samples": "idx_gpu_ts",
+    "cpu_samples_1m": "PRIMARY",
+    "gpu_samples_1m": "PRIMARY",
+}
+
 _initialized = False
+_partitions_day: Optional[int] = None
+_rolled_up_through: Optional[int] = None
+_pool: Optional[MySQLConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> MySQLConnectionPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                if not getattr(mysql.connector, "HAVE_CEXT", False):
+                    log.warning(
+                        "mysql-connector C extension unavailable; using the slower pure-Python driver"
+                    )
+                _pool = MySQLConnectionPool(
+                    pool_name="sentra",
+                    pool_size=_POOL_SIZE,
+                    **config.get_db_config(),
+                )
+    return _pool
+
+
+def _conn() -> PooledMySQLConnection:
+    # close() on a pooled connection hands it back to the pool.
+    pool = _get_pool()
+    deadline = time.monotonic() + _POOL_WAIT_SECONDS
+    while True:
+        try:
+            return pool.get_connection()
+        except PoolError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.05)
+
+
+def connect() -> PooledMySQLConnection:
+    """
+    Check out a pooled connection for callers that want to hold one across
+    several writes (e.g. the agent loop). Call close() to return it.
+    """
+    return _conn()
+
+
+def _pack_per_core(values: List[float]) -> bytes:
+    """per_core is stored as packed little-endian float32 (4 bytes per core) in a BLOB."""
+    return np.asarray(values, dtype="<f4").tobytes()
+
+
+# get_db_config keys that only tune mysql.connector's own client behaviour and
+# have no bearing on how connectorx would connect or decode results.
+_CONNECTORX_IGNORED_KEYS = frozenset(
+    {
+        "host",
+        "port",
+        "user",
+        "password",
+        "database",
+        "autocommit",
+        "raise_on_warnings",
+        "use_pure",
+        "compress",
+        "connection_timeout",
+        "allow_local_infile_in_path",
+    }
+)
+
+
+def _is_true(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+
+def _connectorx_url() -> Optional[str]:
+    """
+    URL for connectorx, or None when the DB config carries options its URL
+    can't express (TLS settings, a non-utf8mb4 charset, ...). Those configs
+    read through the pooled mysql.connector path so reads and writes connect
+    the same way.
+    """
+    cfg = config.get_db_config()
+    for key, value in cfg.items():
+        if key in _CONNECTORX_IGNORED_KEYS:
+            continue
+        if key == "charset" and str(value).lower() in ("utf8mb4", "utf8"):
+            continue
+        # Plain TCP is all connectorx's URL gives us.
+        if key == "ssl_disabled" and _is_true(value):
+            continue
+        return None
+
+    user = quote(str(cfg.get("user", "")), safe="")
+    password = quote(str(cfg.get("password", "")), safe="")
+    return f"mysql://{user}:{password}@{cfg['host']}:{cfg['port']}/{cfg['database']}"
+
+
+_CONNECTORX_URL = _connectorx_url() if cx is not None else None
+
+
+def _read_frame(sql: str, params: Tuple[int, ...]) -> pd.DataFrame:
+    """
+    Run a history SELECT and return it as a DataFrame.
+    `params` are integer epoch bounds, so inlining them for connectorx is safe.
+    """
+    if _CONNECTORX_URL is not None:
+        return cx.read_sql(
+            _CONNECTORX_URL,
+            sql % tuple(int(p) for p in params),
+            return_type="pandas",
+        )
+
+    conn = _conn()
+    try:
+        return pd.read_sql_query(sql, conn, params=params)
+    finally:
+        conn.close()
+
+
+def _schema_sentinel_path() -> Optional[str]:
+    try:
+        data_dir = config.get_data_dir()
+    except OSError:
+        return None
+    return os.path.join(data_dir, f".schema_v{_SCHEMA_VERSION}.ok")
+
+
+def _schema_sentinel_ok(path: Optional[str]) -> bool:
+    """
+    True when a previous process already ran the DDL against the same database.
+    The sentinel stores the DB summary so pointing sentra at another server
+    still triggers schema creation.
+    """
+    if path is None:
+        return False
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            return fh.read().strip() == config.get_db_summary()
+    except OSError:
+        return False
+
+
+def _write_schema_sentinel(path: Optional[str]) -> None:
+    if path is None:
+        return
+    try:
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(config.get_db_summary())
+    except OSError:
+        pass
 
 
-def _conn() -> mysql.connector.connection.MySQLConnection:
-    return mysql.connector.connect(**config.get_db_config())
+def _forget_schema(exc: BaseException) -> None:
+    """
+    On "table doesn't exist" (e.g. the MySQL volume was recreated while the
+    sentinel in the data volume survived), drop the sentinel and in-process
+    state so the next init_db_if_needed() runs the schema pass again.
+    """
+    global _initialized, _partitions_day, _rolled_up_through
+    if not isinstance(exc, mysql.connector.Error) or exc.errno != errorcode.ER_NO_SUCH_TABLE:
+        return
+    log.warning("sentra tables missing, schema will be recreated: %s", exc)
+    _initialized = False
+    _partitions_day = None
+    _rolled_up_through = None
+    sentinel = _schema_sentinel_path()
+    if sentinel is not None:
+        try:
+            os.remove(sentinel)
+        except OSError:
+            pass
+
+
+def _as_text(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode()
+    return value
+
+
+def _day_partition(day: int) -> str:
+    """Partition holding rows up to the end of `day` (days since the epoch, UTC)."""
+    name = time.strftime("p%Y%m%d", time.gmtime(day * _DAY_SECONDS))
+    return f"PARTITION {name} VALUES LESS THAN ({(day + 1) * _DAY_SECONDS})"
+
+
+def _partition_clause(now_ts: int) -> str:
+    today = now_ts // _DAY_SECONDS
+    defs = [_day_partition(d) for d in range(today, today + _PARTITION_DAYS_AHEAD + 1)]
+    defs.append("PARTITION pmax VALUES LESS THAN MAXVALUE")
+    return f"PARTITION BY RANGE (ts) ({', '.join(defs)})"
+
+
+def _partition_bounds(cursor, table: str) -> List[Tuple[str, Optional[int]]]:
+    """
+    Return [(partition_name, upper_bound)] for `table`, upper_bound None for MAXVALUE.
+    Empty when the table isn't partitioned.
+    """
+    cursor.execute(
+        """
+        SELECT PARTITION_NAME, PARTITION_DESCRIPTION
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        ORDER BY PARTITION_ORDINAL_POSITION
+        """,
+        (table,),
+    )
+    bounds = []
+    for name, desc in cursor.fetchall():
+        if name is None:
+            continue
+        desc = _as_text(desc)
+        bounds.append((_as_text(name), None if desc == "MAXVALUE" else int(desc)))
+    return bounds
+
+
+def _rotate_partitions(cursor, now_ts: int) -> None:
+    """
+    Split pmax so every sample table has day partitions through
+    _PARTITION_DAYS_AHEAD days past now_ts.
+    """
+    last_day = now_ts // _DAY_SECONDS + _PARTITION_DAYS_AHEAD
+    for tbl in _SAMPLE_TABLES:
+        bounds = _partition_bounds(cursor, tbl)
+        if not any(bound is None for _, bound in bounds):
+            continue
+        day_bounds = [bound for _, bound in bounds if bound is not None]
+        first_day = max(day_bounds) // _DAY_SECONDS if day_bounds else now_ts // _DAY_SECONDS
+        if first_day > last_day:
+            continue
+        defs = ", ".join(_day_partition(d) for d in range(first_day, last_day + 1))
+        cursor.execute(
+            f"ALTER TABLE {tbl} REORGANIZE PARTITION pmax INTO "
+            f"({defs}, PARTITION pmax VALUES LESS THAN MAXVALUE)"
+        )
 
 
 def init_db_if_needed() -> None:
@@ -43,69 +353,83 @@ def init_db_if_needed() -> None:
     if _initialized:
         return
 
+    sentinel = _schema_sentinel_path()
+    if _schema_sentinel_ok(sentinel):
+        _initialized = True
+        return
+
+    now_ts = int(time.time())
+    partitions = _partition_clause(now_ts)
+
     conn = _conn()
     cursor = conn.cursor()
     try:
         for sql in (
-            """
+            f"""
             CREATE TABLE IF NOT EXISTS cpu_samples (
                 ts BIGINT NOT NULL,
-                total_util DOUBLE,
-                iowait DOUBLE,
-                per_core TEXT,
-                cpu_temp DOUBLE,
+                total_util FLOAT,
+                iowait FLOAT,
+                per_core BLOB,
+                cpu_temp FLOAT,
                 load1 DOUBLE,
                 load5 DOUBLE,
                 load15 DOUBLE,
                 uptime_sec DOUBLE,
-                user_pct DOUBLE,
-                system_pct DOUBLE
+                user_pct FLOAT,
+                system_pct FLOAT
             ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            {partitions}
             """,
-            """
+            f"""
             CREATE TABLE IF NOT EXISTS mem_samples (
                 ts BIGINT NOT NULL,
-                used_percent DOUBLE,
+                used_percent FLOAT,
                 used_bytes BIGINT,
                 total_bytes BIGINT,
-                swap_used_percent DOUBLE
+                swap_used_percent FLOAT
             ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            {partitions}
             """,
-            """
+            f"""
             CREATE TABLE IF NOT EXISTS gpu_samples (
                 ts BIGINT NOT NULL,
                 gpu_index INT,
-                temp DOUBLE,
-                util DOUBLE,
+                temp FLOAT,
+                util FLOAT,
                 power_w DOUBLE,
                 vram_used_mb INT,
                 vram_total_mb INT,
-                fan_percent DOUBLE
+                fan_percent FLOAT
             ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            {partitions}
             """,
-            """
+            f"""
             CREATE TABLE IF NOT EXISTS disk_samples (
                 ts BIGINT NOT NULL,
                 device TEXT,
                 read_bps DOUBLE,
                 write_bps DOUBLE,
-                usage_percent DOUBLE
+                usage_percent FLOAT
             ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            {partitions}
             """,
-            """
+            f"""
             CREATE TABLE IF NOT EXISTS net_samples (
                 ts BIGINT NOT NULL,
                 iface TEXT,
                 rx_bps DOUBLE,
                 tx_bps DOUBLE
             ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            {partitions}
             """,
-            """
+            f"""
             CREATE TABLE IF NOT EXISTS fan_samples (
                 ts BIGINT NOT NULL,
                 label TEXT,
                 rpm DOUBLE
             ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            {partitions}
             """,
             """
             CREATE TABLE IF NOT EXISTS dashboard_settings (
@@ -125,6 +449,33 @@ def init_db_if_needed() -> None:
                 hidden TINYINT NOT NULL
             ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
             """,
+            """
+            CREATE TABLE IF NOT EXISTS cpu_samples_1m (
+                ts BIGINT NOT NULL PRIMARY KEY,
+                total_util FLOAT,
+                cpu_temp FLOAT
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS mem_samples_1m (
+                ts BIGINT NOT NULL PRIMARY KEY,
+                used_percent FLOAT,
+                swap_used_percent FLOAT
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS gpu_samples_1m (
+                ts BIGINT NOT NULL,
+                gpu_index INT NOT NULL,
+                temp FLOAT,
+                util FLOAT,
+                power_w DOUBLE,
+                vram_used_mb INT,
+                vram_total_mb INT,
+                fan_percent FLOAT,
+                PRIMARY KEY (ts, gpu_index)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """,
         ):
             cursor.execute(sql)
 
@@ -135,6 +486,7 @@ def init_db_if_needed() -> None:
             "CREATE INDEX idx_disk_ts ON disk_samples(ts)",
             "CREATE INDEX idx_net_ts ON net_samples(ts)",
             "CREATE INDEX idx_fan_ts ON fan_samples(ts)",
+            "CREATE INDEX idx_gpu_idx_ts ON gpu_samples(gpu_index, ts)",
         ):
             try:
                 cursor.execute(sql)
@@ -152,182 +504,456 @@ def init_db_if_needed() -> None:
                     return
                 raise
 
-        _ensure_column("cpu_samples", "user_pct", "DOUBLE")
-        _ensure_column("cpu_samples", "system_pct", "DOUBLE")
+        def _column_type(table: str, column: str) -> Optional[str]:
+            cursor.execute(
+                """
+                SELECT DATA_TYPE
+                FROM information_schema.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+                """,
+                (table, column),
+            )
+            row = cursor.fetchone()
+            return _as_text(row[0]).lower() if row else None
+
+        _ensure_column("cpu_samples", "user_pct", "FLOAT")
+        _ensure_column("cpu_samples", "system_pct", "FLOAT")
+
+        # Sensor readings only carry ~0.1 precision, so percentages and
+        # temperatures are FLOAT; tables created as DOUBLE are narrowed once.
+        for tbl, columns in _FLOAT_COLUMNS.items():
+            pending = [col for col in columns if _column_type(tbl, col) != "float"]
+            if pending:
+                cursor.execute(
+                    f"ALTER TABLE {tbl} "
+                    + ", ".join(f"MODIFY COLUMN {col} FLOAT" for col in pending)
+                )
+
+        per_core_type = _column_type("cpu_samples", "per_core")
+        if per_core_type != "blob":
+            if per_core_type != "varbinary":
+                # Legacy JSON text can't be reinterpreted as packed floats; only
+                # the latest sample's per_core is ever read, so drop the old values.
+                cursor.execute("UPDATE cpu_samples SET per_core = NULL")
+            # BLOB rather than a sized VARBINARY: hosts with hundreds of logical
+            # CPUs would otherwise hit 1406 "Data too long" on every insert.
+            cursor.execute("ALTER TABLE cpu_samples MODIFY COLUMN per_core BLOB")
+
+        # Tables created before partitioning was introduced (or by the C# API)
+        # are converted in place; this rebuilds them once.
+        for tbl in _SAMPLE_TABLES:
+            if not _partition_bounds(cursor, tbl):
+                cursor.execute(f"ALTER TABLE {tbl} {partitions}")
+        _rotate_partitions(cursor, now_ts)
 
         conn.commit()
         _initialized = True
+        _write_schema_sentinel(sentinel)
     finally:
         cursor.close()
         conn.close()
 
 
-def insert_snapshot(snapshot: Dict[str, Any], gpus: List[Dict[str, Any]]) -> None:
-    """
-    Take snapshot dict from system_collector + list of GPU dicts from gpu_collector,
-    and append them to MySQL.
-    """
-    init_db_if_needed()
+# Column order used when writing each sample table.
+_INSERT_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "cpu_samples": (
+        "ts",
+        "total_util",
+        "iowait",
+        "per_core",
+        "cpu_temp",
+        "load1",
+        "load5",
+        "load15",
+        "uptime_sec",
+        "user_pct",
+        "system_pct",
+    ),
+    "mem_samples": ("ts", "used_percent", "used_bytes", "total_bytes", "swap_used_percent"),
+    "gpu_samples": (
+        "ts",
+        "gpu_index",
+        "temp",
+        "util",
+        "power_w",
+        "vram_used_mb",
+        "vram_total_mb",
+        "fan_percent",
+    ),
+    "disk_samples": ("ts", "device", "read_bps", "write_bps", "usage_percent"),
+    "net_samples": ("ts", "iface", "rx_bps", "tx_bps"),
+    "fan_samples": ("ts", "label", "rpm"),
+}
 
-    conn = _conn()
-    cursor = conn.cursor()
-    try:
-        ts = int(snapshot["ts"])
+# Tables with more pending rows than this (e.g. when flushing ticks buffered
+# while MySQL was down) are written with LOAD DATA LOCAL INFILE. cpu_samples
+# carries the packed binary per_core column, which doesn't survive TSV.
+_BULK_LOAD_THRESHOLD = 500
+_BULK_LOAD_TABLES = frozenset(_SAMPLE_TABLES) - {"cpu_samples"}
 
-        cpu = snapshot["cpu"]
-        meta = snapshot["meta"]
-        breakdown = cpu.get("breakdown", {})
-        cursor.execute(
-            """
-            INSERT INTO cpu_samples
-            (ts,total_util,iowait,per_core,cpu_temp,load1,load5,load15,uptime_sec,user_pct,system_pct)
-            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-            """,
-            (
-                ts,
-                cpu["total_util"],
-                cpu["iowait"],
-                json.dumps(cpu["per_core"]),
-                cpu["temp"],
-                cpu["load"]["1m"],
-                cpu["load"]["5m"],
-                cpu["load"]["15m"],
-                meta["uptime_sec"],
-                breakdown.get("user"),
-                breakdown.get("system"),
-            ),
+# 1148: command not allowed, 2068: client rejected the file, 3948: local_infile off
+_LOCAL_INFILE_REJECTED = {1148, 2068, 3948}
+_bulk_load_ok = True
+
+# Prepared INSERT cursors per caller-held connection, one per table. Server-side
+# statements don't survive the session reset a pool return performs, so only
+# connections kept open across calls (the agent's) get entries, and they go
+# away with the connection object.
+_local = threading.local()
+
+
+def _snapshot_rows(
+    snapshot: Dict[str, Any],
+    gpus: List[Dict[str, Any]],
+    rows: Dict[str, List[tuple]],
+) -> None:
+    """Append one tick's rows to `rows`, keyed by table."""
+    ts = int(snapshot["ts"])
+
+    cpu = snapshot["cpu"]
+    meta = snapshot["meta"]
+    breakdown = cpu.get("breakdown", {})
+    rows["cpu_samples"].append(
+        (
+            ts,
+            cpu["total_util"],
+            cpu["iowait"],
+            _pack_per_core(cpu["per_core"]),
+            cpu["temp"],
+            cpu["load"]["1m"],
+            cpu["load"]["5m"],
+            cpu["load"]["15m"],
+            meta["uptime_sec"],
+            breakdown.get("user"),
+            breakdown.get("system"),
         )
+    )
+
+    mem = snapshot["mem"]
+    rows["mem_samples"].append(
+        (
+            ts,
+            mem["used_percent"],
+            mem["used_bytes"],
+            mem["total_bytes"],
+            mem["swap_used_percent"],
+        )
+    )
+
+    rows["gpu_samples"].extend(
+        (
+            ts,
+            g["index"],
+            g["temp"],
+            g["util"],
+            g["power_w"],
+            g["vram_used_mb"],
+            g["vram_total_mb"],
+            g["fan_percent"],
+        )
+        for g in gpus
+        if "error" not in g
+    )
+
+    disk_data = snapshot["disk"]
+    usage_percent = disk_data["root_usage_percent"]
+    rows["disk_samples"].extend(
+        (ts, dev, vals["read_bps"], vals["write_bps"], usage_percent)
+        for dev, vals in disk_data["throughput"].items()
+    )
+
+    rows["net_samples"].extend(
+        (ts, iface, vals["rx_bps"], vals["tx_bps"])
+        for iface, vals in snapshot["net"]["throughput"].items()
+    )
+
+    rows["fan_samples"].extend((ts, label, rpm) for label, rpm in snapshot["fans"].items())
 
-        mem = snapshot["mem"]
+
+def _tsv_field(value: Any) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, str):
+        return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+    return str(value)
+
+
+def _bulk_load(cursor, table: str, columns: Tuple[str, ...], rows: List[tuple]) -> None:
+    """Write `rows` into `table` via a temporary TSV file and LOAD DATA LOCAL INFILE."""
+    fd, path = tempfile.mkstemp(suffix=".tsv", dir=config.get_bulk_load_dir())
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as fh:
+            for row in rows:
+                fh.write("\t".join(_tsv_field(v) for v in row))
+                fh.write("\n")
         cursor.execute(
-            """
-            INSERT INTO mem_samples
-            (ts,used_percent,used_bytes,total_bytes,swap_used_percent)
-            VALUES (%s,%s,%s,%s,%s)
+            f"""
+            LOAD DATA LOCAL INFILE %s INTO TABLE {table}
+            CHARACTER SET utf8mb4
+            FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\'
+            LINES TERMINATED BY '\\n'
+            ({','.join(columns)})
             """,
-            (
-                ts,
-                mem["used_percent"],
-                mem["used_bytes"],
-                mem["total_bytes"],
-                mem["swap_used_percent"],
-            ),
+            (path,),
         )
+    finally:
+        # The load itself already happened (or failed with its own error);
+        # a leftover staging file must not turn into a duplicate INSERT.
+        try:
+            os.remove(path)
+        except OSError:
+            pass
 
-        for g in gpus:
-            if "error" in g:
-                continue
-            cursor.execute(
-                """
-                INSERT INTO gpu_samples
-                (ts,gpu_index,temp,util,power_w,vram_used_mb,vram_total_mb,fan_percent)
-                VALUES (%s,%s,%s,%s,%s,%s,%s,%s)
-                """,
-                (
-                    ts,
-                    g["index"],
-                    g["temp"],
-                    g["util"],
-                    g["power_w"],
-                    g["vram_used_mb"],
-                    g["vram_total_mb"],
-                    g["fan_percent"],
-                ),
-            )
 
-        disk_data = snapshot["disk"]
-        usage_percent = disk_data["root_usage_percent"]
-        for dev, vals in disk_data["throughput"].items():
-            cursor.execute(
-                """
-                INSERT INTO disk_samples
-                (ts,device,read_bps,write_bps,usage_percent)
-                VALUES (%s,%s,%s,%s,%s)
-                """,
-                (
-                    ts,
-                    dev,
-                    vals["read_bps"],
-                    vals["write_bps"],
-                    usage_percent,
-                ),
-            )
+def _insert_sql(table: str) -> str:
+    columns = _INSERT_COLUMNS[table]
+    return f"INSERT INTO {table} ({','.join(columns)}) VALUES ({','.join(['%s'] * len(columns))})"
 
-        for iface, vals in snapshot["net"]["throughput"].items():
-            cursor.execute(
-                """
-                INSERT INTO net_samples
-                (ts,iface,rx_bps,tx_bps)
-                VALUES (%s,%s,%s,%s)
-                """,
-                (
-                    ts,
-                    iface,
-                    vals["rx_bps"],
-                    vals["tx_bps"],
-                ),
-            )
 
-        for label, rpm in snapshot["fans"].items():
-            cursor.execute(
-                """
-                INSERT INTO fan_samples
-                (ts,label,rpm)
-                VALUES (%s,%s,%s)
-                """,
-                (
-                    ts,
-                    label,
-                    rpm,
-                ),
-            )
+def _prepared_cursor(conn: PooledMySQLConnection, table: str):
+    cache = getattr(_local, "prepared", None)
+    if cache is None:
+        cache = _local.prepared = weakref.WeakKeyDictionary()
+    cursors = cache.setdefault(conn, {})
+    stmt = cursors.get(table)
+    if stmt is None:
+        stmt = cursors[table] = conn.cursor(prepared=True)
+    return stmt
+
+
+def _write_rows(
+    cursor,
+    table: str,
+    rows: List[tuple],
+    held_conn: Optional[PooledMySQLConnection] = None,
+) -> None:
+    """
+    Single rows on a caller-held connection go through a cached prepared
+    cursor (binary protocol, statement parsed once per connection). Multi-row
+    sets use executemany, which a prepared cursor would send row by row.
+    """
+    global _bulk_load_ok
+    if not rows:
+        return
+
+    if held_conn is not None and len(rows) == 1:
+        _prepared_cursor(held_conn, table).execute(_insert_sql(table), rows[0])
+        return
+
+    columns = _INSERT_COLUMNS[table]
+    if _bulk_load_ok and table in _BULK_LOAD_TABLES and len(rows) > _BULK_LOAD_THRESHOLD:
+        try:
+            _bulk_load(cursor, table, columns, rows)
+            return
+        except mysql.connector.Error as exc:
+            if exc.errno not in _LOCAL_INFILE_REJECTED:
+                raise
+            log.warning("LOAD DATA LOCAL INFILE unavailable, using INSERT: %s", exc)
+            _bulk_load_ok = False
+        except OSError as exc:
+            # Staging directory missing or not writable.
+            log.warning("Can't stage LOAD DATA file, using INSERT: %s", exc)
+            _bulk_load_ok = False
+
+    # mysql.connector rewrites this into a single multi-VALUES INSERT.
+    cursor.executemany(_insert_sql(table), rows)
+
+
+def _rollup_minutes(cursor, latest_ts: int) -> Optional[int]:
+    """
+    Refresh the *_1m tables for every minute completed since the last rollup
+    (averages, with maxima for temperatures and VRAM). Re-running a minute
+    just overwrites it, so overlapping windows are harmless.
+    Returns the new rolled-up-through ts (to record after commit), or None if
+    nothing was due.
+    """
+    end = latest_ts // 60 * 60
+    if _rolled_up_through is None:
+        start = end - _ROLLUP_BACKFILL_SECONDS
+    elif end > _rolled_up_through:
+        # Re-cover the previous minute in case a late tick landed in it.
+        start = _rolled_up_through - 60
+    else:
+        return None
+
+    for sql in (
+        """
+        INSERT INTO cpu_samples_1m (ts, total_util, cpu_temp)
+        SELECT ts DIV 60 * 60 AS minute_ts, AVG(total_util), MAX(cpu_temp)
+        FROM cpu_samples
+        WHERE ts >= %s AND ts < %s
+        GROUP BY minute_ts
+        ON DUPLICATE KEY UPDATE
+            total_util = VALUES(total_util),
+            cpu_temp = VALUES(cpu_temp)
+        """,
+        """
+        INSERT INTO mem_samples_1m (ts, used_percent, swap_used_percent)
+        SELECT ts DIV 60 * 60 AS minute_ts, AVG(used_percent), AVG(swap_used_percent)
+        FROM mem_samples
+        WHERE ts >= %s AND ts < %s
+        GROUP BY minute_ts
+        ON DUPLICATE KEY UPDATE
+            used_percent = VALUES(used_percent),
+            swap_used_percent = VALUES(swap_used_percent)
+        """,
+        """
+        INSERT INTO gpu_samples_1m
+        (ts, gpu_index, temp, util, power_w, vram_used_mb, vram_total_mb, fan_percent)
+        SELECT ts DIV 60 * 60 AS minute_ts, gpu_index, MAX(temp), AVG(util), AVG(power_w),
+               MAX(vram_used_mb), MAX(vram_total_mb), AVG(fan_percent)
+        FROM gpu_samples
+        WHERE ts >= %s AND ts < %s
+        GROUP BY minute_ts, gpu_index
+        ON DUPLICATE KEY UPDATE
+            temp = VALUES(temp),
+            util = VALUES(util),
+            power_w = VALUES(power_w),
+            vram_used_mb = VALUES(vram_used_mb),
+            vram_total_mb = VALUES(vram_total_mb),
+            fan_percent = VALUES(fan_percent)
+        """,
+    ):
+        cursor.execute(sql, (start, end))
+
+    return end
+
+
+def insert_snapshot(
+    snapshot: Dict[str, Any],
+    gpus: List[Dict[str, Any]],
+    conn: Optional[PooledMySQLConnection] = None,
+) -> None:
+    """
+    Take snapshot dict from system_collector + list of GPU dicts from gpu_collector,
+    and append them to MySQL.
+    If `conn` is given it is used as-is and left open for the caller.
+    """
+    insert_snapshots([(snapshot, gpus)], conn=conn)
+
+
+def insert_snapshots(
+    batch: List[Tuple[Dict[str, Any], List[Dict[str, Any]]]],
+    conn: Optional[PooledMySQLConnection] = None,
+) -> None:
+    """
+    Write several (snapshot, gpus) ticks in one transaction, e.g. samples the
+    agent buffered while MySQL was unreachable.
+    If `conn` is given it is used as-is and left open for the caller.
+    """
+    global _partitions_day, _rolled_up_through
+    if not batch:
+        return
+
+    rows: Dict[str, List[tuple]] = {tbl: [] for tbl in _SAMPLE_TABLES}
+    for snapshot, gpus in batch:
+        _snapshot_rows(snapshot, gpus, rows)
+
+    owns_conn = conn is None
+    if owns_conn:
+        conn = _conn()
+    cursor = conn.cursor()
+    try:
+        # ALTER TABLE commits implicitly, so keep it ahead of this batch's inserts.
+        latest_ts = max(int(snapshot["ts"]) for snapshot, _ in batch)
+        day = latest_ts // _DAY_SECONDS
+        if _partitions_day != day:
+            _rotate_partitions(cursor, latest_ts)
+            _partitions_day = day
+
+        for tbl in _SAMPLE_TABLES:
+            _write_rows(cursor, tbl, rows[tbl], None if owns_conn else conn)
+
+        rolled_up_through = _rollup_minutes(cursor, latest_ts)
 
         conn.commit()
+        if rolled_up_through is not None:
+            _rolled_up_through = rolled_up_through
+    except Exception as exc:
+        _forget_schema(exc)
+        # A held connection outlives this call; don't leave a half-written batch
+        # in its open transaction.
+        if not owns_conn:
+            conn.rollback()
+        raise
     finally:
         cursor.close()
-        conn.close()
+        if owns_conn:
+            conn.close()
+
+
+def _history_range(minutes: int) -> Tuple[int, int]:
+    """Half-open [since, until) epoch range covering the last `minutes`, including this second."""
+    now = int(time.time())
+    return now - minutes * 60, now + 1
+
+
+def _use_rollups(minutes: int) -> bool:
+    """Long windows read the minute rollups; short ones keep raw resolution."""
+    return minutes >= _ROLLUP_MIN_WINDOW_MINUTES
+
+
+def _raw_tail_start(rollup_table: str) -> str:
+    """
+    SQL expression for the first ts not yet covered by `rollup_table`
+    (0 while it is empty). Rollups trail the newest sample by up to a
+    minute, so raw rows from here on are appended to keep the live edge.
+    """
+    return f"(SELECT COALESCE(MAX(ts) + 60, 0) FROM {rollup_table})"
+
+
+def _host_history_select(suffix: str, lower: str) -> str:
+    # cpu and mem rows are written in the same tick with the same ts, so a
+    # LEFT JOIN lines them up server-side in one fetch. Both sides carry the
+    # bounds so each table's partitions are pruned.
+    cpu_table = f"cpu_samples{suffix}"
+    return f"""
+        SELECT c.ts, c.total_util, c.cpu_temp, m.used_percent, m.swap_used_percent
+        FROM {cpu_table} c FORCE INDEX ({_HISTORY_TS_INDEX[cpu_table]})
+        LEFT JOIN mem_samples{suffix} m ON m.ts = c.ts AND m.ts >= {lower} AND m.ts < %s
+        WHERE c.ts >= {lower} AND c.ts < %s
+        """
+
+
+def _gpu_history_select(suffix: str, lower: str) -> str:
+    gpu_table = f"gpu_samples{suffix}"
+    return f"""
+        SELECT ts, gpu_index, temp, util, power_w, vram_used_mb, vram_total_mb, fan_percent
+        FROM {gpu_table} FORCE INDEX ({_HISTORY_TS_INDEX[gpu_table]})
+        WHERE ts >= {lower} AND ts < %s
+        """
 
 
 def get_cpu_mem_history(minutes: int = 60) -> pd.DataFrame:
     """
     Return CPU+memory+swap history for the last `minutes` minutes as one DataFrame.
+    Windows of an hour or more come from the per-minute rollups, with raw
+    samples after the newest rolled-up minute appended.
     Columns:
         ts, total_util, cpu_temp, used_percent, swap_used_percent, timestamp
     """
-    init_db_if_needed()
-
-    since = int(time.time() - minutes * 60)
-    conn = _conn()
-    try:
-        df_cpu = pd.read_sql_query(
-            """
-            SELECT ts, total_util, cpu_temp
-            FROM cpu_samples
-            WHERE ts >= %s
-            ORDER BY ts ASC
-            """,
-            conn,
-            params=(since,),
+    since, until = _history_range(minutes)
+    params: Tuple[int, ...] = (since, until, since, until)
+    if _use_rollups(minutes):
+        tail_start = f"GREATEST(%s, {_raw_tail_start('cpu_samples_1m')})"
+        sql = (
+            _host_history_select("_1m", "%s")
+            + "UNION ALL"
+            + _host_history_select("", tail_start)
         )
+        params = params * 2
+    else:
+        sql = _host_history_select("", "%s")
 
-        df_mem = pd.read_sql_query(
-            """
-            SELECT ts, used_percent, swap_used_percent
-            FROM mem_samples
-            WHERE ts >= %s
-            ORDER BY ts ASC
-            """,
-            conn,
-            params=(since,),
-        )
-    finally:
-        conn.close()
+    df = _read_frame(sql, params)
 
-    if df_cpu.empty and df_mem.empty:
+    if df.empty:
         return pd.DataFrame()
 
-    df = pd.merge(df_cpu, df_mem, on="ts", how="outer").sort_values("ts")
-    df["timestamp"] = pd.to_datetime(df["ts"], unit="s")
+    # Rows arrive nearly in index order, which mergesort handles in ~linear time.
+    df = df.sort_values("ts", kind="mergesort", ignore_index=True)
+
+    df["timestamp"] = df["ts"].to_numpy(dtype="int64").view("datetime64[s]")
     return df
 
 
@@ -335,53 +961,76 @@ def get_gpu_history(minutes: int = 60) -> pd.DataFrame:
     """
     Return GPU telemetry for the last `minutes` minutes as a pandas DataFrame
     with a timestamp column for plotting.
+    Windows of an hour or more come from the per-minute rollups, with raw
+    samples after the newest rolled-up minute appended.
     """
-    init_db_if_needed()
-
-    since = int(time.time() - minutes * 60)
-    conn = _conn()
-    try:
-        df = pd.read_sql_query(
-            """
-            SELECT ts, gpu_index, temp, util, power_w, vram_used_mb, vram_total_mb, fan_percent
-            FROM gpu_samples
-            WHERE ts >= %s
-            ORDER BY ts ASC
-            """,
-            conn,
-            params=(since,),
+    since, until = _history_range(minutes)
+    params: Tuple[int, ...] = (since, until)
+    if _use_rollups(minutes):
+        tail_start = f"GREATEST(%s, {_raw_tail_start('gpu_samples_1m')})"
+        sql = (
+            _gpu_history_select("_1m", "%s")
+            + "UNION ALL"
+            + _gpu_history_select("", tail_start)
         )
-    finally:
-        conn.close()
+        params = params * 2
+    else:
+        sql = _gpu_history_select("", "%s")
+
+    df = _read_frame(sql, params)
 
     if df.empty:
         return df
 
-    df["timestamp"] = pd.to_datetime(df["ts"], unit="s")
+    df = df.sort_values("ts", kind="mergesort", ignore_index=True)
+
+    df["timestamp"] = df["ts"].to_numpy(dtype="int64").view("datetime64[s]")
     return df
 
 
 def purge_before(cutoff_ts: float) -> None:
     """
     Delete all rows older than cutoff_ts from every table.
+    Whole day partitions below the cutoff are dropped; only the remainder
+    of the partition straddling the cutoff is deleted, in committed chunks.
     """
-    init_db_if_needed()
-
     conn = _conn()
     cursor = conn.cursor()
     try:
         cutoff = int(cutoff_ts)
-        for tbl in (
-            "cpu_samples",
-            "mem_samples",
-            "gpu_samples",
-            "disk_samples",
-            "net_samples",
-            "fan_samples",
-        ):
-            cursor.execute(f"DELETE FROM {tbl} WHERE ts < %s", (cutoff,))
+        for tbl in _SAMPLE_TABLES + _ROLLUP_TABLES:
+            expired = [
+                name
+                for name, bound in _partition_bounds(cursor, tbl)
+                if bound is not None and bound <= cutoff
+            ]
+            if expired:
+                cursor.execute(f"ALTER TABLE {tbl} DROP PARTITION {', '.join(expired)}")
+            while True:
+                cursor.execute(
+                    f"DELETE FROM {tbl} WHERE ts < %s LIMIT {_PURGE_CHUNK_ROWS}",
+                    (cutoff,),
+                )
+                conn.commit()
+                if cursor.rowcount < _PURGE_CHUNK_ROWS:
+                    break
+
+        # A cutoff in the future drops upcoming day partitions too; recreate them.
+        _rotate_partitions(cursor, int(time.time()))
 
         conn.commit()
+    except Exception as exc:
+        _forget_schema(exc)
+        raise
     finally:
         cursor.close()
         conn.close()
+
+
+if not os.getenv("SENTRA_SKIP_DB_INIT"):
+    try:
+        init_db_if_needed()
+    except mysql.connector.Error as exc:
+        # MySQL may not be reachable yet (e.g. container start order); callers
+        # retry via init_db_if_needed() before their first write.
+        log.warning("Deferring sentra schema init: %s", exc)
@@ -9,29 +9,89 @@ from __future__ import annotations
 
 import time
 import traceback
+from collections import deque
+
+import mysql.connector
 
 from config import config
 from collector import logger
+import api.datastore as datastore
+
+# Keep up to an hour of samples while MySQL is unreachable; they are written
+# in one batch once a connection succeeds again.
+MAX_PENDING_TICKS = max(3600 // max(config.SAMPLE_INTERVAL, 1), 1)
+
+
+def _discard_connection(conn):
+    if conn is not None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+    return None
+
+
+def _store_pending(pending: deque, conn) -> None:
+    """
+    Write every buffered tick. MySQL errors propagate and leave the buffer
+    intact; any other failure means a malformed tick, so the ticks are
+    retried one at a time and only the ones that still fail are dropped.
+    """
+    try:
+        datastore.insert_snapshots(list(pending), conn=conn)
+        pending.clear()
+        return
+    except mysql.connector.Error:
+        raise
+    except Exception:
+        traceback.print_exc()
+
+    while pending:
+        try:
+            datastore.insert_snapshots([pending[0]], conn=conn)
+        except mysql.connector.Error:
+            raise
+        except Exception:
+            traceback.print_exc()
+        pending.popleft()
 
 
 def main() -> None:
     prev_disk = None
     prev_net = None
     last_tick = time.time()
+    # One pooled connection is held across ticks and only replaced after a
+    # MySQL error, so the loop doesn't check out a connection per sample.
+    conn = None
+    pending = deque(maxlen=MAX_PENDING_TICKS)
 
     while True:
         start = time.time()
         interval_s = max(start - last_tick, 0.001)
 
         try:
-            snapshot, gpus, containers, prev_disk, prev_net = logger.collect_and_store(
+            snapshot, gpus, containers, prev_disk, prev_net = logger.collect_snapshot(
                 prev_disk=prev_disk,
                 prev_net=prev_net,
                 interval_s=interval_s,
             )
+            pending.append((snapshot, gpus))
         except Exception:
             traceback.print_exc()
 
+        if pending:
+            try:
+                if conn is None:
+                    datastore.init_db_if_needed()
+                    conn = datastore.connect()
+                _store_pending(pending, conn)
+            except mysql.connector.Error:
+                traceback.print_exc()
+                conn = _discard_connection(conn)
+            except Exception:
+                # Setup failure outside the per-tick writes; keep the buffer.
+                traceback.print_exc()
+
         last_tick = start
         elapsed = time.time() - start
         sleep_for = max(config.SAMPLE_INTERVAL - elapsed, 0.5)
@@ -23,6 +23,34 @@ import collector.docker_collector as docker_collector
 import api.datastore as datastore
 
 
+def collect_snapshot(
+    prev_disk: Optional[Dict[str, psutil._common.sdiskio]],
+    prev_net: Optional[Dict[str, psutil._common.snetio]],
+    interval_s: float,
+) -> Tuple[
+    Dict[str, Any],
+    List[Dict[str, Any]],
+    List[Dict[str, Any]],
+    Dict[str, psutil._common.sdiskio],
+    Dict[str, psutil._common.snetio],
+]:
+    """
+    Collect a fresh snapshot (system + gpu + docker) without touching MySQL.
+    Returns the same tuple as collect_and_store.
+    """
+    snapshot, new_disk, new_net = system_collector.collect_system_snapshot(
+        prev_disk=prev_disk,
+        prev_net=prev_net,
+        interval_s=interval_s,
+    )
+    gpus = gpu_collector.collect_gpu_snapshot()
+
+    # collect docker containers (does NOT go into DB)
+    containers = docker_collector.collect_docker_containers()
+
+    return snapshot, gpus, containers, new_disk, new_net
+
+
 def collect_and_store(
     prev_disk: Optional[Dict[str, psutil._common.sdiskio]],
     prev_net: Optional[Dict[str, psutil._common.snetio]],
@@ -45,15 +73,11 @@ def collect_and_store(
         new_disk_counters (psutil.disk_io_counters(perdisk=True))
         new_net_counters (psutil.net_io_counters(pernic=True))
     """
-    snapshot, new_disk, new_net = system_collector.collect_system_snapshot(
+    snapshot, gpus, containers, new_disk, new_net = collect_snapshot(
         prev_disk=prev_disk,
         prev_net=prev_net,
         interval_s=interval_s,
     )
-    gpus = gpu_collector.collect_gpu_snapshot()
-
-    # collect docker containers (does NOT go into DB)
-    containers = docker_collector.collect_docker_containers()
 
     datastore.insert_snapshot(snapshot, gpus)
 
@@ -7,6 +7,10 @@ from urllib.parse import parse_qsl, urlparse
 # but this is the fallback / container default.
 SAMPLE_INTERVAL = int(os.getenv("SENTRA_SAMPLE_INTERVAL", "2"))
 
+# MySQL connections kept per process. The Streamlit dashboard shares one pool
+# across all browser sessions, so raise this for many concurrent viewers.
+DB_POOL_SIZE = int(os.getenv("SENTRA_DB_POOL_SIZE", "8"))
+
 # Default retention helper constants (used for purge buttons)
 ONE_HOUR = 60 * 60
 ONE_DAY = ONE_HOUR * 24
@@ -31,6 +35,20 @@ def get_data_dir() -> str:
     return candidate
 
 
+def _bulk_load_dir_path() -> str:
+    return os.path.join(os.path.abspath(_DEFAULT_DATA_DIR), "bulk")
+
+
+def get_bulk_load_dir() -> str:
+    """
+    Returns the only directory the MySQL client may read LOAD DATA LOCAL INFILE
+    files from. Ensures the directory exists.
+    """
+    candidate = _bulk_load_dir_path()
+    os.makedirs(candidate, exist_ok=True)
+    return candidate
+
+
 def _parse_url(url: str) -> Dict[str, Any]:
     parsed = urlparse(url)
     params = dict(parse_qsl(parsed.query))
@@ -45,10 +63,7 @@ def _parse_url(url: str) -> Dict[str, Any]:
     }
 
 
-def get_db_config() -> Dict[str, Any]:
-    """
-    Returns kwargs usable by mysql.connector.connect.
-    """
+def _build_db_config() -> Dict[str, Any]:
     if _DB_URL:
         cfg = _parse_url(_DB_URL)
     else:
@@ -67,11 +82,27 @@ def get_db_config() -> Dict[str, Any]:
     # CREATE TABLE IF NOT EXISTS.
     cfg.setdefault("raise_on_warnings", False)
     cfg.setdefault("ssl_disabled", True)
-    cfg.setdefault("use_pure", True)
+    # Prefer the C extension; mysql.connector falls back to the pure-Python
+    # implementation when it isn't available.
+    cfg.setdefault("use_pure", False)
+    cfg.setdefault("compress", True)
+    # Restrict LOAD DATA LOCAL INFILE to sentra's own staging directory.
+    cfg.setdefault("allow_local_infile_in_path", _bulk_load_dir_path())
     cfg.setdefault("connection_timeout", 30)
     return cfg
 
 
+_DB_CONFIG = _build_db_config()
+
+
+def get_db_config() -> Dict[str, Any]:
+    """
+    Returns kwargs usable by mysql.connector.connect.
+    The environment is parsed once at import; callers get their own copy.
+    """
+    return dict(_DB_CONFIG)
+
+
 def get_db_summary() -> str:
     cfg = get_db_config()
     user = cfg.get("user", "root")
@@ -1,4 +1,5 @@
 using System;
+using System.Buffers.Binary;
 using System.Collections.Generic;
 using System.Linq;
 using System.Text.Json;
@@ -65,37 +66,37 @@ public class TelemetryRepository
                 """
                 CREATE TABLE IF NOT EXISTS cpu_samples (
                     ts BIGINT NOT NULL,
-                    total_util DOUBLE,
-                    iowait DOUBLE,
-                    per_core TEXT,
-                    cpu_temp DOUBLE,
+                    total_util FLOAT,
+                    iowait FLOAT,
+                    per_core BLOB,
+                    cpu_temp FLOAT,
                     load1 DOUBLE,
                     load5 DOUBLE,
                     load15 DOUBLE,
                     uptime_sec DOUBLE,
-                    user_pct DOUBLE,
-                    system_pct DOUBLE
+                    user_pct FLOAT,
+                    system_pct FLOAT
                 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
                 """,
                 """
                 CREATE TABLE IF NOT EXISTS mem_samples (
                     ts BIGINT NOT NULL,
-                    used_percent DOUBLE,
+                    used_percent FLOAT,
                     used_bytes BIGINT,
                     total_bytes BIGINT,
-                    swap_used_percent DOUBLE
+                    swap_used_percent FLOAT
                 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
                 """,
                 """
                 CREATE TABLE IF NOT EXISTS gpu_samples (
                     ts BIGINT NOT NULL,
                     gpu_index INT,
-                    temp DOUBLE,
-                    util DOUBLE,
+                    temp FLOAT,
+                    util FLOAT,
                     power_w DOUBLE,
                     vram_used_mb INT,
                     vram_total_mb INT,
-                    fan_percent DOUBLE
+                    fan_percent FLOAT
                 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
                 """,
                 """
@@ -104,7 +105,7 @@ public class TelemetryRepository
                     device TEXT,
                     read_bps DOUBLE,
                     write_bps DOUBLE,
-                    usage_percent DOUBLE
+                    usage_percent FLOAT
                 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
                 """,
                 """
@@ -139,6 +140,33 @@ public class TelemetryRepository
                     gpu_index INT PRIMARY KEY,
                     hidden TINYINT NOT NULL
                 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+                """,
+                """
+                CREATE TABLE IF NOT EXISTS cpu_samples_1m (
+                    ts BIGINT NOT NULL PRIMARY KEY,
+                    total_util FLOAT,
+                    cpu_temp FLOAT
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+                """,
+                """
+                CREATE TABLE IF NOT EXISTS mem_samples_1m (
+                    ts BIGINT NOT NULL PRIMARY KEY,
+                    used_percent FLOAT,
+                    swap_used_percent FLOAT
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+                """,
+                """
+                CREATE TABLE IF NOT EXISTS gpu_samples_1m (
+                    ts BIGINT NOT NULL,
+                    gpu_index INT NOT NULL,
+                    temp FLOAT,
+                    util FLOAT,
+                    power_w DOUBLE,
+                    vram_used_mb INT,
+                    vram_total_mb INT,
+                    fan_percent FLOAT,
+                    PRIMARY KEY (ts, gpu_index)
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
                 """
             };
 
@@ -156,7 +184,8 @@ public class TelemetryRepository
                 "CREATE INDEX idx_gpu_ts ON gpu_samples(ts)",
                 "CREATE INDEX idx_disk_ts ON disk_samples(ts)",
                 "CREATE INDEX idx_net_ts ON net_samples(ts)",
-                "CREATE INDEX idx_fan_ts ON fan_samples(ts)"
+                "CREATE INDEX idx_fan_ts ON fan_samples(ts)",
+                "CREATE INDEX idx_gpu_idx_ts ON gpu_samples(gpu_index, ts)"
             };
 
             foreach (var sql in indexStatements)
@@ -431,7 +460,10 @@ public class TelemetryRepository
             "gpu_samples",
             "disk_samples",
             "net_samples",
-            "fan_samples"
+            "fan_samples",
+            "cpu_samples_1m",
+            "mem_samples_1m",
+            "gpu_samples_1m"
         };
 
         await using var conn = await OpenConnectionAsync();
@@ -453,7 +485,10 @@ public class TelemetryRepository
             "gpu_samples",
             "disk_samples",
             "net_samples",
-            "fan_samples"
+            "fan_samples",
+            "cpu_samples_1m",
+            "mem_samples_1m",
+            "gpu_samples_1m"
         };
 
         await using var conn = await OpenConnectionAsync();
@@ -484,8 +519,7 @@ public class TelemetryRepository
         }
 
         var ts = ReadLong(reader, 0) ?? DateTimeOffset.UtcNow.ToUnixTimeSeconds();
-        var perCoreRaw = reader.IsDBNull(2) ? "[]" : reader.GetString(2);
-        var perCore = ParsePerCore(perCoreRaw);
+        var perCore = reader.IsDBNull(2) ? Array.Empty<double>() : ParsePerCore(reader.GetValue(2));
 
         return new CpuSummary(
             DateTimeOffset.FromUnixTimeSeconds(ts).UtcDateTime,
@@ -798,11 +832,25 @@ public class TelemetryRepository
         return results;
     }
 
-    private static IReadOnlyList<double> ParsePerCore(string json)
+    private static IReadOnlyList<double> ParsePerCore(object raw)
     {
+        // The collector stores per_core as packed little-endian float32; rows
+        // written before that migration hold a JSON array in a TEXT column.
+        if (raw is byte[] packed)
+        {
+            var values = new double[packed.Length / sizeof(float)];
+            for (var i = 0; i < values.Length; i++)
+            {
+                var bits = BinaryPrimitives.ReadInt32LittleEndian(packed.AsSpan(i * sizeof(float)));
+                values[i] = BitConverter.Int32BitsToSingle(bits);
+            }
+
+            return values;
+        }
+
         try
         {
-            var arr = JsonSerializer.Deserialize<List<double>>(json, JsonOpts);
+            var arr = JsonSerializer.Deserialize<List<double>>(raw as string ?? "[]", JsonOpts);
             return arr?.Select(x => (double)x).ToArray() ?? Array.Empty<double>();
         }
         catch
@@ -45,6 +45,10 @@ from config import config
 import api.datastore as datastore
 import collector.logger as logger
 
+# No-op once the schema exists; covers MySQL being unreachable when
+# api.datastore was first imported.
+datastore.init_db_if_needed()
+
 
 # ---------- Page setup ----------
 st.set_page_config(page_title="sentra dashboard", layout="wide")